@@ -23,9 +23,12 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
+import string
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -36,6 +39,24 @@ try:
 except Exception:
     HAS_SNS = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
+
+# Parser JSON: orjson se disponível, senão json da stdlib (ambos aceitam bytes,
+# evitando a decodificação UTF-8 prévia). O orjson rejeita NaN/Infinity, que o
+# json.dump do Python grava; nesses casos o arquivo é relido com a stdlib.
+try:
+    import orjson
+    _loads = orjson.loads
+    _FAST_DECODE_ERRORS: Tuple = (orjson.JSONDecodeError,)
+except Exception:
+    _loads = json.loads
+    _FAST_DECODE_ERRORS = ()
+
 PREFERRED_STATS = ["p95", "mean", "value"]
 
 PRETTY_TITLES = {
@@ -67,6 +88,11 @@ AGG_METRICS_TO_INCLUDE = [
     "requests_per_second",
 ]
 
+_CONCURRENCY_RE = re.compile(r"_concurrency_(\d+)_")
+_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9_\-\s]+")
+_SAFE_METRIC_RE = re.compile(r"[^a-zA-Z0-9_\-]+")
+_FIELD_NAME_RE = re.compile(r"[^.\[]*")
+
 # Métricas para o multiplot
 MULTIPLOT_METRICS = [
     "e2e_latency",
@@ -80,9 +106,15 @@ MULTIPLOT_METRICS = [
 ]
 
 def to_float(value) -> Optional[float]:
+    # Caminho rápido: a grande maioria dos valores já chega como float/int
+    t = type(value)
+    if t is float:
+        return value
+    if t is int:
+        return float(value)
     if value is None:
         return None
-    if isinstance(value, str):
+    if t is str:
         s = value.strip()
         if not s or s.startswith("{") or s.startswith("["):
             return None
@@ -90,6 +122,7 @@ def to_float(value) -> Optional[float]:
             return float(s)
         except ValueError:
             return None
+    # Subclasses (ex: bool) mantêm o comportamento anterior
     if isinstance(value, (int, float)):
         return float(value)
     return None
@@ -98,7 +131,7 @@ def extract_concurrency(json_data, filename: str) -> Optional[int]:
     # Preferencialmente pega do JSON
     if "aggregated_metrics" in json_data and "num_concurrency" in json_data["aggregated_metrics"]:
         return json_data["aggregated_metrics"]["num_concurrency"]
-    m = re.search(r"_concurrency_(\d+)_", filename)
+    m = _CONCURRENCY_RE.search(filename)
     if m:
         return int(m.group(1))
     return None
@@ -106,76 +139,104 @@ def extract_concurrency(json_data, filename: str) -> Optional[int]:
 def discover_json_files(platform_dir: Path) -> List[Path]:
     return sorted([f for f in platform_dir.glob("*.json") if f.is_file()])
 
-def load_platform_rows(platform_dir: Path, platform_label: str) -> List[Dict]:
-    rows: List[Dict] = []
-    for json_file in discover_json_files(platform_dir):
+def _parse_one(json_file: Path) -> Optional[Dict]:
+    """Lê um JSON de resultado e retorna seu "aggregated_metrics"; None se ilegível/inválido.
+
+    O restante do documento (ex: a lista "individual_request_metrics") não é
+    referenciado e é liberado ao retornar.
+    """
+    try:
+        raw = json_file.read_bytes()
         try:
-            data = json.loads(json_file.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        agg = data.get("aggregated_metrics", {})
-        stats = agg.get("stats", {})
-        scenario = agg.get("scenario")
-        concurrency = agg.get("num_concurrency") if "num_concurrency" in agg else extract_concurrency(data, json_file.name)
-        # 1. Adiciona stats como antes
-        for metric, stat_dict in stats.items():
-            for stat, value in stat_dict.items():
-                val = to_float(value)
-                if val is None:
-                    continue
-                rows.append({
-                    "platform_label": platform_label,
-                    "scenario": scenario,
-                    "metric_base": metric,
-                    "stat": stat.lower(),
-                    "concurrency": concurrency,
-                    "value": val,
-                })
-        # 2. Adiciona métricas agregadas solicitadas
-        for metric in AGG_METRICS_TO_INCLUDE:
-            val = to_float(agg.get(metric))
-            if val is not None:
-                rows.append({
-                    "platform_label": platform_label,
-                    "scenario": scenario,
-                    "metric_base": metric,
-                    "stat": "mean",
-                    "concurrency": concurrency,
-                    "value": val,
-                })
-        # 3. Adiciona outras agregadas simples (ex: error_rate)
-        for metric in ["error_rate", "num_completed_requests"]:
-            val = to_float(agg.get(metric))
+            data = _loads(raw)
+        except _FAST_DECODE_ERRORS:
+            data = json.loads(raw)
+        agg = data.get("aggregated_metrics") or {}
+    except Exception:
+        return None
+    return agg
+
+ROW_COLUMNS = ("platform_label", "scenario", "metric_base", "stat", "concurrency", "value")
+CATEGORICAL_COLUMNS = ("platform_label", "scenario", "metric_base", "stat")
+
+SIMPLE_AGG_METRICS = ["error_rate", "num_completed_requests"]
+
+def _rows_for(agg: Dict, platform_label: str, scenario, concurrency) -> Iterator[Tuple]:
+    """Gera as linhas (na ordem de ROW_COLUMNS) de um único arquivo de resultado."""
+    # 1. Stats por métrica
+    for metric, stat_dict in agg.get("stats", {}).items():
+        for stat, value in stat_dict.items():
+            val = to_float(value)
             if val is not None:
-                rows.append({
-                    "platform_label": platform_label,
-                    "scenario": scenario,
-                    "metric_base": metric,
-                    "stat": "value",
-                    "concurrency": concurrency,
-                    "value": val,
-                })
-    return rows
+                yield (platform_label, scenario, metric, stat.lower(), concurrency, val)
+    # 2. Métricas agregadas solicitadas
+    for metric in AGG_METRICS_TO_INCLUDE:
+        val = to_float(agg.get(metric))
+        if val is not None:
+            yield (platform_label, scenario, metric, "mean", concurrency, val)
+    # 3. Outras agregadas simples (ex: error_rate)
+    for metric in SIMPLE_AGG_METRICS:
+        val = to_float(agg.get(metric))
+        if val is not None:
+            yield (platform_label, scenario, metric, "value", concurrency, val)
+
+def load_platform_rows(platform_dir: Path, platform_label: str) -> pd.DataFrame:
+    """Retorna as linhas da plataforma como DataFrame (colunas de ROW_COLUMNS)."""
+    json_files = discover_json_files(platform_dir)
+    if not json_files:
+        return pd.DataFrame(columns=list(ROW_COLUMNS))
+    # Leitura + parse em threads: só a leitura dos arquivos (I/O) se sobrepõe, pois
+    # o parse (orjson/json) segura o GIL e continua efetivamente serial
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(json_files))
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        parsed = list(ex.map(_parse_one, json_files))
+
+    def records() -> Iterator[Tuple]:
+        for json_file, agg in zip(json_files, parsed):
+            if agg is None:
+                print(f"[AVISO] Arquivo ignorado (JSON ilegível ou inválido): {json_file}")
+                continue
+            scenario = agg.get("scenario")
+            if "num_concurrency" in agg:
+                concurrency = agg["num_concurrency"]
+            else:
+                m = _CONCURRENCY_RE.search(json_file.name)
+                concurrency = int(m.group(1)) if m else None
+            yield from _rows_for(agg, platform_label, scenario, concurrency)
+
+    return pd.DataFrame.from_records(records(), columns=list(ROW_COLUMNS))
 
 def build_dataframe(root: Path, scenarios_filter: Optional[List[str]] = None, concurrencies_filter: Optional[List[int]] = None) -> pd.DataFrame:
-    rows: List[Dict] = []
+    dfs: List[pd.DataFrame] = []
     for platform_dir in sorted(root.iterdir()):
         if not platform_dir.is_dir():
             continue
         platform_label = platform_dir.name
-        platform_rows = load_platform_rows(platform_dir, platform_label)
+        platform_df = load_platform_rows(platform_dir, platform_label)
         if scenarios_filter:
-            platform_rows = [row for row in platform_rows if row["scenario"] in scenarios_filter]
+            platform_df = platform_df[platform_df["scenario"].isin(scenarios_filter)]
         if concurrencies_filter:
-            platform_rows = [row for row in platform_rows if row["concurrency"] in concurrencies_filter]
-        rows.extend(platform_rows)
-    if not rows:
+            platform_df = platform_df[platform_df["concurrency"].isin(concurrencies_filter)]
+        if not platform_df.empty:
+            dfs.append(platform_df)
+    if not dfs:
         raise SystemExit("Nenhum dado numérico encontrado no novo formato.")
-    df = pd.DataFrame(rows)
-    return df.sort_values(["metric_base", "stat", "platform_label", "scenario", "concurrency"]).reset_index(drop=True)
+    df = pd.concat(dfs, ignore_index=True)
+    df = df.sort_values(["metric_base", "stat", "platform_label", "scenario", "concurrency"]).reset_index(drop=True)
+    # Colunas de baixa cardinalidade como categóricas (menos memória, groupby/isin mais rápidos)
+    for c in CATEGORICAL_COLUMNS:
+        df[c] = df[c].astype("category")
+    return df
+
+def available_stats_by_metric(df: pd.DataFrame) -> Dict[str, set]:
+    """Conjunto de estatísticas presentes por métrica, numa única passada (códigos categóricos)."""
+    available: Dict[str, set] = {}
+    pairs = df.groupby(["metric_base", "stat"], observed=True, sort=False).size().index
+    for metric, stat in pairs:
+        available.setdefault(metric, set()).add(stat)
+    return available
 
-def choose_stat_for_metric(df_metric: pd.DataFrame, only_p95: bool = False) -> str:
-    available = set(df_metric["stat"].unique())
+def _pick_stat(available: set, only_p95: bool = False) -> str:
     if only_p95:
         if "p95" in available:
             return "p95"
@@ -208,15 +269,81 @@ def setup_style():
     else:
         plt.style.use("seaborn-v0_8-whitegrid")
 
+LABEL_FIELDS = {
+    "platform": "platform_label",
+    "scenario": "scenario",
+}
+
+DEFAULT_LEGEND_FORMAT = "{platform}-{scenario}"
+
+def _label_part(col: pd.Series, conversion: Optional[str], format_spec: str, accessor: str = "") -> pd.Series:
+    if accessor or conversion or format_spec:
+        # Acesso a índice/atributo ou conversão/especificador explícito: formata valor a valor
+        template = "{0" + accessor + (f"!{conversion}" if conversion else "") + (f":{format_spec}" if format_spec else "") + "}"
+        fmt = template.format
+        # Valor ausente (NaN) formatado como None, igual a str.format; em categóricas
+        # o map roda só nas categorias e devolve outra categórica, daí o astype(str)
+        return col.map(lambda v: fmt(None if pd.isna(v) else v)).astype(str)
+    return col.astype(str).fillna("None")
+
+def _format_rows(df: pd.DataFrame, legend_format: str) -> pd.Series:
+    """Formata o template linha a linha (caso geral, ex: especificador aninhado)."""
+    fields = {name: df[col].astype(object).where(df[col].notna(), None) for name, col in LABEL_FIELDS.items()}
+    return pd.Series(
+        [legend_format.format(**dict(zip(fields, values))) for values in zip(*fields.values())],
+        index=df.index, dtype=object,
+    )
+
 def build_labels(df: pd.DataFrame, legend_format: str) -> pd.DataFrame:
-    df = df.copy()
-    def make_label(row):
-        return legend_format.format(
-            platform=row["platform_label"],
-            scenario=row["scenario"],
-        )
-    df["label"] = df.apply(make_label, axis=1)
-    return df
+    """Retorna df com a coluna "label"; assign evita copiar as colunas existentes."""
+    if legend_format == DEFAULT_LEGEND_FORMAT:
+        label = _label_part(df["platform_label"], None, "") + "-" + _label_part(df["scenario"], None, "")
+        return df.assign(label=label)
+    # Template genérico: decompõe uma vez em literais/campos e concatena colunas inteiras
+    label = pd.Series("", index=df.index, dtype=object)
+    for literal, field, format_spec, conversion in string.Formatter().parse(legend_format):
+        if literal:
+            label = label + literal
+        if field is None:
+            continue
+        if "{" in format_spec:
+            # Especificador que referencia outro campo: sem decomposição por coluna
+            return df.assign(label=_format_rows(df, legend_format))
+        # Nome do campo até o primeiro "." ou "[" (ex: platform[0], scenario.upper)
+        name = _FIELD_NAME_RE.match(field).group(0)
+        if name not in LABEL_FIELDS:
+            # Mesmo erro de str.format com apenas argumentos nomeados
+            if name == "" or name.isdigit():
+                raise IndexError(f"Replacement index {name or 0} out of range for positional args tuple")
+            raise KeyError(name)
+        label = label + _label_part(df[LABEL_FIELDS[name]], conversion, format_spec, field[len(name):])
+    return df.assign(label=label)
+
+def _lines_by_label(dsub: pd.DataFrame) -> Dict[str, Tuple]:
+    """Arrays (concurrency, value) ordenados por concurrency para cada label, num único groupby."""
+    dsorted = dsub.sort_values("concurrency", kind="stable")
+    return {
+        label: (dline["concurrency"].to_numpy(), dline["value"].to_numpy())
+        for label, dline in dsorted.groupby("label", sort=False, observed=True)
+    }
+
+def build_color_map(df: pd.DataFrame) -> Tuple[List[str], Dict[str, object]]:
+    """Labels ordenados e a cor de cada um (mesmas cores no multiplot e nos gráficos individuais).
+
+    Depende do estilo ativo, portanto deve ser chamado após setup_style().
+    """
+    labels = sorted(df["label"].unique())
+    base_colors = plt.rcParams.get("axes.prop_cycle").by_key().get("color", ["#1f77b4", "#ff7f0e"])
+    if HAS_SNS and len(labels) > len(base_colors):
+        extra = sns.color_palette("tab20", n_colors=max(len(labels), 20))
+        palette = extra
+    else:
+        repeats = (len(labels) // len(base_colors)) + 1
+        palette = (base_colors * repeats)[: len(labels)]
+    return labels, dict(zip(labels, palette))
+
+# Folga (em pontos) entre o topo da legenda e os rótulos do eixo X do multiplot
+LEGEND_PAD_POINTS = 6
 
 def plot_multiplot(
     df: pd.DataFrame,
@@ -224,20 +351,15 @@ def plot_multiplot(
     logx: bool,
     show: bool,
     experiment_name: Optional[str] = None,
+    labels: Optional[List[str]] = None,
+    color_map: Optional[Dict[str, object]] = None,
 ):
     """Cria um multiplot com 8 métricas principais em uma grade 2x4"""
     out_dir.mkdir(parents=True, exist_ok=True)
     setup_style()
 
-    labels = sorted(df["label"].unique())
-    base_colors = plt.rcParams.get("axes.prop_cycle").by_key().get("color", ["#1f77b4", "#ff7f0e"])
-    if HAS_SNS and len(labels) > len(base_colors):
-        extra = sns.color_palette("tab20", n_colors=max(len(labels), 20))
-        palette = extra
-    else:
-        repeats = (len(labels) // len(base_colors)) + 1
-        palette = (base_colors * repeats)[: len(labels)]
-    color_map = dict(zip(labels, palette))
+    if labels is None or color_map is None:
+        labels, color_map = build_color_map(df)
 
     # Filtra apenas as métricas do multiplot
     df_multiplot = df[df["metric_base"].isin(MULTIPLOT_METRICS)]
@@ -257,6 +379,8 @@ def plot_multiplot(
     else:
         fig.suptitle("Performance Metrics Overview", fontsize=16, y=0.98)
 
+    bbox_style = dict(boxstyle="round,pad=0.2", fc="white", alpha=0.7)
+    legend_handles_by_label: Dict[str, object] = {}
     for i, metric in enumerate(available_metrics):
         if i >= len(axes):
             break
@@ -272,13 +396,15 @@ def plot_multiplot(
 
         # Plot das linhas para cada label
         handles = []
+        annots = []
+        lines = _lines_by_label(dsub)
         for label in labels:
-            dline = dsub[dsub["label"] == label].sort_values("concurrency")
-            if dline.empty:
+            if label not in lines:
                 continue
+            x, y = lines[label]
             h = ax.plot(
-                dline["concurrency"],
-                dline["value"],
+                x,
+                y,
                 label=label,
                 color=color_map[label],
                 linewidth=2,
@@ -287,20 +413,23 @@ def plot_multiplot(
                 alpha=0.9,
             )[0]
             handles.append(h)
+            legend_handles_by_label.setdefault(label, h)
 
-            # Anotação do último valor
-            if len(dline) > 0:
-                last = dline.iloc[-1]
-                ax.annotate(
-                    human_fmt(last["value"]),
-                    xy=(last["concurrency"], last["value"]),
-                    xytext=(3, 3),
-                    textcoords="offset points",
-                    fontsize=8,
-                    color=color_map[label],
-                    weight="bold",
-                    bbox=dict(boxstyle="round,pad=0.2", fc="white", ec=color_map[label], alpha=0.7),
-                )
+            # Guarda o último valor para anotar em lote
+            annots.append((x[-1], y[-1], color_map[label]))
+
+        # Anotação do último valor de cada linha
+        for x, y, color in annots:
+            ax.annotate(
+                human_fmt(y),
+                xy=(x, y),
+                xytext=(3, 3),
+                textcoords="offset points",
+                fontsize=8,
+                color=color,
+                weight="bold",
+                bbox={**bbox_style, "ec": color},
+            )
 
         stat_label = "P95" if chosen_stat == "p95" else ("Mean" if chosen_stat == "mean" else chosen_stat)
         metric_title = pretty_title(metric)
@@ -324,84 +453,138 @@ def plot_multiplot(
     for i in range(len(available_metrics), len(axes)):
         axes[i].set_visible(False)
 
-    # Legenda global
-    if labels:
-        # Pega os handles da primeira subplot que tem dados
-        legend_handles = []
-        for i, metric in enumerate(available_metrics):
-            dsub = df_multiplot[df_multiplot["metric_base"] == metric]
-            if not dsub.empty:
-                for label in labels:
-                    dline = dsub[dsub["label"] == label].sort_values("concurrency")
-                    if not dline.empty:
-                        h = plt.Line2D([0], [0], color=color_map[label], linewidth=2, label=label)
-                        legend_handles.append(h)
-                break
-
-        # Remove duplicatas mantendo a ordem
-        seen = set()
-        unique_handles = []
-        for h in legend_handles:
-            if h.get_label() not in seen:
-                seen.add(h.get_label())
-                unique_handles.append(h)
-
-        fig.legend(
-            unique_handles,
-            [h.get_label() for h in unique_handles],
-            loc='center',
-            bbox_to_anchor=(0.5, 0.02),
-            ncol=min(len(unique_handles), 4),
+    # Legenda global (handles capturados durante o plot, um por label),
+    # ancorada na borda inferior da figura
+    legend = None
+    legend_labels = [label for label in labels if label in legend_handles_by_label]
+    if legend_labels:
+        legend = fig.legend(
+            [legend_handles_by_label[label] for label in legend_labels],
+            legend_labels,
+            loc='lower center',
+            bbox_to_anchor=(0.5, 0.0),
+            ncol=min(len(legend_labels), 4),
             fontsize=10,
             frameon=True,
             framealpha=0.9
         )
 
     plt.tight_layout()
-    plt.subplots_adjust(top=0.93, bottom=0.12)
+    # Reserva embaixo a altura da legenda (cresce com o número de linhas) mais o
+    # espaço dos ticks e do rótulo do eixo X da última linha, ambos medidos no
+    # renderer, dispensando bbox_inches='tight' no savefig
+    bottom = 0.12
+    if legend is not None:
+        renderer = fig.canvas.get_renderer()
+        fig_height = fig.bbox.height
+        legend_top = legend.get_window_extent(renderer).y1 / fig_height
+        visible_axes = [ax for ax in axes if ax.get_visible()]
+        lowest = min(ax.get_position().y0 for ax in visible_axes)
+        xaxis_extent = max(
+            ax.get_position().y0 - ax.get_tightbbox(renderer).y0 / fig_height
+            for ax in visible_axes
+            if ax.get_position().y0 == lowest
+        )
+        pad = LEGEND_PAD_POINTS / 72 * fig.dpi / fig_height
+        bottom = max(bottom, legend_top + xaxis_extent + pad)
+    plt.subplots_adjust(top=0.93, bottom=bottom)
 
     # Salva o multiplot
     multiplot_path = out_dir / "multiplot_overview.png"
-    fig.savefig(multiplot_path, dpi=300, bbox_inches='tight')
+    fig.savefig(multiplot_path, dpi=150)
     print(f"[OK] Multiplot: {multiplot_path}")
 
     plt.close(fig)
     if show:
         plt.show()
 
+# Mínimo de métricas por processo ao paralelizar plot_metrics: cada figura leva
+# ~0.2 s, e cada worker paga a importação de pandas/matplotlib (spawn) e a cópia
+# do DataFrame; abaixo disso (ex: --skip-individual) tudo roda no processo atual
+MIN_METRICS_PER_WORKER = 4
+
 def plot_metrics(
     df: pd.DataFrame,
     out_dir: Path,
     logx: bool,
     show: bool,
     experiment_name: Optional[str] = None,
+    labels: Optional[List[str]] = None,
+    color_map: Optional[Dict[str, object]] = None,
 ):
     out_dir.mkdir(parents=True, exist_ok=True)
     setup_style()
-    labels = sorted(df["label"].unique())
-    base_colors = plt.rcParams.get("axes.prop_cycle").by_key().get("color", ["#1f77b4", "#ff7f0e"])
-    if HAS_SNS and len(labels) > len(base_colors):
-        extra = sns.color_palette("tab20", n_colors=max(len(labels), 20))
-        palette = extra
-    else:
-        repeats = (len(labels) // len(base_colors)) + 1
-        palette = (base_colors * repeats)[: len(labels)]
-    color_map = dict(zip(labels, palette))
+    if labels is None or color_map is None:
+        labels, color_map = build_color_map(df)
     metrics = df["metric_base"].unique().tolist()
+    # Cada processo renderiza um subconjunto das métricas (renderização Agg é CPU-bound);
+    # com poucas métricas por processo o custo de subir o pool supera o ganho
+    n_workers = min(os.cpu_count() or 1, len(metrics) // MIN_METRICS_PER_WORKER)
+    rendered: Dict[str, Path] = {}
+    if n_workers <= 1:
+        rendered.update(_render_metrics(df, metrics, out_dir, labels, color_map, logx, experiment_name))
+    else:
+        chunks = [metrics[i::n_workers] for i in range(n_workers)]
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_render_worker) as ex:
+            futures = [
+                ex.submit(
+                    _render_metrics,
+                    df[df["metric_base"].isin(chunk)],
+                    chunk,
+                    out_dir,
+                    labels,
+                    color_map,
+                    logx,
+                    experiment_name,
+                )
+                for chunk in chunks
+            ]
+            for fut in futures:
+                rendered.update(fut.result())
+    for metric in metrics:
+        if metric in rendered:
+            print(f"[OK] Figura: {rendered[metric]}")
+    if show:
+        plt.show()
+
+def _init_render_worker():
+    plt.switch_backend("Agg")
+    setup_style()
+
+def _render_metrics(
+    df: pd.DataFrame,
+    metrics: List[str],
+    out_dir: Path,
+    labels: List[str],
+    color_map: Dict[str, object],
+    logx: bool,
+    experiment_name: Optional[str] = None,
+) -> List[Tuple[str, Path]]:
+    """Renderiza um PNG por métrica, reaproveitando uma única figura."""
+    bbox_style = dict(boxstyle="round,pad=0.25", fc="white", alpha=0.85)
+    # Uma única figura reaproveitada para todas as métricas
+    fig, ax = plt.subplots(figsize=(9.2, 5.4))
+    # tight_layout altera os subplotpars; restaura os originais a cada métrica
+    sp = fig.subplotpars
+    default_subplotpars = dict(left=sp.left, right=sp.right, bottom=sp.bottom, top=sp.top)
+    rendered: List[Tuple[str, Path]] = []
     for metric in metrics:
         dsub = df[df["metric_base"] == metric]
         if dsub.empty:
             continue
         chosen_stat = dsub["stat"].iloc[0]
-        fig, ax = plt.subplots(figsize=(9.2, 5.4))
+        ax.clear()
+        fig.subplots_adjust(**default_subplotpars)
         handles = []
+        annots = []
+        lines = _lines_by_label(dsub)
         for label in labels:
-            dline = dsub[dsub["label"] == label].sort_values("concurrency")
-            if dline.empty:
+            if label not in lines:
                 continue
+            x, y = lines[label]
             h = ax.plot(
-                dline["concurrency"],
-                dline["value"],
+                x,
+                y,
                 label=label,
                 color=color_map[label],
                 linewidth=2.3,
@@ -410,16 +593,17 @@ def plot_metrics(
                 alpha=0.95,
             )[0]
             handles.append(h)
-            last = dline.iloc[-1]
+            annots.append((x[-1], y[-1], color_map[label]))
+        for x, y, color in annots:
             ax.annotate(
-                human_fmt(last["value"]),
-                xy=(last["concurrency"], last["value"]),
+                human_fmt(y),
+                xy=(x, y),
                 xytext=(5, 6),
                 textcoords="offset points",
                 fontsize=10,
-                color=color_map[label],
+                color=color,
                 weight="bold",
-                bbox=dict(boxstyle="round,pad=0.25", fc="white", ec=color_map[label], alpha=0.85),
+                bbox={**bbox_style, "ec": color},
             )
         stat_label = "P95" if chosen_stat == "p95" else ("Mean" if chosen_stat == "mean" else chosen_stat)
         metric_title = pretty_title(metric)
@@ -452,30 +636,36 @@ def plot_metrics(
         for lh in leg.legend_handles:
             lh.set_linewidth(2.8)
         fig.tight_layout()
-        safe = re.sub(r"[^a-zA-Z0-9_\-]+", "_", metric)
+        safe = _SAFE_METRIC_RE.sub("_", metric)
         png_path = out_dir / f"{safe}_{stat_label.lower()}.png"
         fig.savefig(png_path, dpi=220)
-        print(f"[OK] Figura: {png_path}")
-        plt.close(fig)
-        if show:
-            plt.show()
+        rendered.append((metric, png_path))
+    plt.close(fig)
+    return rendered
+
+def write_csv(df: pd.DataFrame, csv_path: Path):
+    """Grava o CSV via writer nativo do Arrow (multi-thread) quando disponível."""
+    if HAS_PYARROW:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(csv_path))
+    else:
+        df.to_csv(csv_path, index=False)
 
 def sanitize_experiment_name(name: str) -> str:
     """Sanitiza o nome do experimento para uso como nome de diretório"""
-    return re.sub(r"[^a-zA-Z0-9_\-\s]+", "_", name).strip()
+    return _SANITIZE_RE.sub("_", name).strip()
 
 def main():
     parser = argparse.ArgumentParser(description="Plota múltiplas abordagens usando múltiplos cenários (novo formato + métricas agregadas).")
     parser.add_argument("--root", type=Path, default=Path("results"), help="Raiz contendo pastas de variantes.")
     parser.add_argument("--scenarios", nargs="*", help="Filtrar cenários (conforme chave 'scenario' do JSON).")
     parser.add_argument("--concurrencies", type=str, help="Filtrar concorrências específicas (ex: '1,2,4,8,16,32'). Se não especificado, usa todas.")
-    parser.add_argument("--legend-format", default="{platform}-{scenario}", help="Template do rótulo (placeholders: {platform},{scenario})")
+    parser.add_argument("--legend-format", default=DEFAULT_LEGEND_FORMAT, help="Template do rótulo (placeholders: {platform},{scenario})")
     parser.add_argument("--out-dir", type=Path, default=Path("figures_multi"), help="Diretório de saída (será sobrescrito se --experiment for usado).")
     parser.add_argument("--experiment", type=str, help="Nome do experimento (ex: 'Llama 3.3 70B', 'Scout', 'Maverick')")
     parser.add_argument("--logx", action="store_true", help="Escala log2 no eixo X.")
     parser.add_argument("--show", action="store_true", help="Mostrar interativamente.")
     parser.add_argument("--only-p95", action="store_true", help="Força usar somente p95 se existir (fallback).")
-    parser.add_argument("--skip-individual", action="store_true", help="Pula gráficos individuais, gera apenas o multiplot.")
+    parser.add_argument("--skip-individual", action="store_true", help="Pula gráficos individuais, gera apenas o multiplot (o CSV inclui só as métricas do multiplot).")
     args = parser.parse_args()
 
     # Parse concurrencies filter
@@ -495,26 +685,31 @@ def main():
         output_dir = args.out_dir
 
     raw_df = build_dataframe(args.root, scenarios_filter=args.scenarios, concurrencies_filter=concurrencies_filter)
+    if args.skip_individual:
+        # Só o multiplot será gerado: descarta as demais métricas antes de labels/CSV
+        raw_df = raw_df[raw_df["metric_base"].isin(MULTIPLOT_METRICS)].reset_index(drop=True)
     # Escolhe por métrica a estatística (globalmente).
-    chosen_parts = []
-    for metric in raw_df["metric_base"].unique():
-        dm = raw_df[raw_df["metric_base"] == metric]
-        stat = choose_stat_for_metric(dm, only_p95=args.only_p95)
-        chosen_parts.append(dm[dm["stat"] == stat])
-    df_pref = pd.concat(chosen_parts, ignore_index=True)
+    stats_by_metric = available_stats_by_metric(raw_df)
+    chosen = {metric: _pick_stat(available, only_p95=args.only_p95) for metric, available in stats_by_metric.items()}
+    chosen_stat = raw_df["metric_base"].map(chosen).astype(raw_df["stat"].dtype)
+    df_pref = raw_df[raw_df["stat"] == chosen_stat].reset_index(drop=True)
     # Constrói labels
     df_pref = build_labels(df_pref, args.legend_format)
     output_dir.mkdir(parents=True, exist_ok=True)
     csv_path = output_dir / "metrics_selected_multi.csv"
-    df_pref.sort_values(["metric_base", "platform_label", "scenario", "concurrency"]).to_csv(csv_path, index=False)
+    write_csv(df_pref.sort_values(["metric_base", "platform_label", "scenario", "concurrency"]), csv_path)
     print(f"[OK] CSV consolidado: {csv_path}")
 
+    # Labels e cores calculados uma única vez e compartilhados entre os gráficos
+    setup_style()
+    labels, color_map = build_color_map(df_pref)
+
     # Gera o multiplot
-    plot_multiplot(df_pref, output_dir, logx=args.logx, show=args.show, experiment_name=args.experiment)
+    plot_multiplot(df_pref, output_dir, logx=args.logx, show=args.show, experiment_name=args.experiment, labels=labels, color_map=color_map)
 
     # Gera gráficos individuais (a menos que seja explicitamente desabilitado)
     if not args.skip_individual:
-        plot_metrics(df_pref, output_dir, logx=args.logx, show=args.show, experiment_name=args.experiment)
+        plot_metrics(df_pref, output_dir, logx=args.logx, show=args.show, experiment_name=args.experiment, labels=labels, color_map=color_map)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file